@@ -3,12 +3,22 @@ Medical Chatbot with gemma3n via Ollama - Fixed Version
 """
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import warnings
+import json
+import logging
+import re
+import threading
 import time
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
+logger = logging.getLogger(__name__)
+
 st.set_page_config(
     page_title="Medical Chatbot with gemma3n",
     page_icon="🏥",
@@ -16,59 +26,206 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-SYSTEM_PROMPT = """You are a medical information assistant using the gemma3n model. Follow these rules:
+SYSTEM_PROMPT = """You are a medical information assistant (gemma3n).
+- Greetings: reply warmly, ask how you can help.
+- Possible emergency: tell them to call 112/115 immediately.
+- Health concerns: give helpful information, 2-3 possible causes, empathetic tone, recommend a healthcare professional.
+- Never give specific diagnoses or medication recommendations.
+- End with: "Please consult a healthcare professional for proper diagnosis."
+"""
 
-1. EMERGENCY SYMPTOMS: If patient mentions chest pain, difficulty breathing, severe bleeding, heart attack, stroke symptoms, loss of consciousness, severe burns, choking, poisoning, or allergic reaction:
-   → Respond: "🚨 EMERGENCY: [symptom] detected! Call emergency services IMMEDIATELY (112 or 115). Do NOT wait for further instructions."
+CRITICAL_SYMPTOMS = (
+    "chest pain", "difficulty breathing", "severe bleeding", "heart attack",
+    "stroke symptoms", "loss of consciousness", "severe burns", "choking",
+    "poisoning", "allergic reaction", "suicidal thoughts"
+)
 
-2. MEDICAL FORM REQUESTS: If patient mentions "form", "doctor", "contact doctor", "see doctor", "severe condition":
-   → Respond: "📋 Medical Form Available In The Menu. Fill out the form and it will be sent to one of our trusted doctors."
+# Emergencies and form requests are answered client-side, never by the model
+# Matched as whole words; bare "doctor" is left out so "my doctor said..." still reaches the model
+FORM_TRIGGERS = (
+    "form", "need a doctor", "contact doctor", "contact a doctor", "contact my doctor",
+    "see doctor", "see a doctor", "appointment", "severe condition"
+)
 
-3. GENERAL SYMPTOMS: For other health concerns:
-   → Provide helpful medical information
-   → Suggest 2-3 possible causes
-   → Recommend consulting healthcare professionals
-   → Use empathetic language
+FORM_RESPONSE = "📋 Medical Form Available In The Menu. Fill out the form and it will be sent to one of our trusted doctors."
 
-4. GREETINGS: Respond warmly and ask how you can help.
+# Keywords for the rule-based fallback when Ollama is unavailable
+GREETINGS = ("hi", "hello", "hey", "good morning", "good afternoon")
 
-Always end with: "Please consult a healthcare professional for proper diagnosis."
-Never provide specific diagnoses or medication recommendations."""
+FALLBACK_ADVICE = {
+    "headache": """For headaches, consider these approaches:
 
-CRITICAL_SYMPTOMS = [
-    "chest pain", "difficulty breathing", "severe bleeding", "heart attack",
-    "stroke symptoms", "loss of consciousness", "severe burns", "choking",
-    "poisoning", "allergic reaction", "suicidal thoughts"
-]
+**Immediate relief:**
+- Rest in a quiet, dark room
+- Apply cold or warm compress
+- Stay hydrated
+- Gentle neck/shoulder massage
+
+**When to see a doctor:**
+- Sudden, severe headaches
+- Headaches with fever, stiff neck, or vision changes
+- Persistent or worsening headaches""",
+    "fever": """For fever management:
+
+**Home care:**
+- Rest and drink plenty of fluids
+- Use fever reducers as directed
+- Monitor temperature regularly
+- Light, comfortable clothing
+
+**Seek medical attention if:**
+- Fever above 103°F (39.4°C)
+- Fever with severe symptoms
+- Fever in young children or elderly
+- Persistent fever over 3 days""",
+    "cough": """For cough relief:
+
+**Home remedies:**
+- Stay hydrated with warm liquids
+- Use a humidifier
+- Honey (for children over 1 year)
+- Avoid irritants and smoke
+
+**See a doctor if:**
+- Cough produces blood
+- Persistent cough over 2 weeks
+- Cough with high fever
+- Difficulty breathing"""
+}
+
+FALLBACK_FOOTER = "Please consult a healthcare professional for proper diagnosis.\n\n⚠️ *Fallback response - Ollama/gemma3n not available*"
+
+FALLBACK_RESPONSES = {topic: f"{advice}\n\n{FALLBACK_FOOTER}" for topic, advice in FALLBACK_ADVICE.items()}
+
+
+def keyword_pattern(keywords, whole_words=False):
+    """Case-insensitive alternation, longest phrase first so the most specific one is reported"""
+    pattern = "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    if whole_words:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Compiled once so each message is screened in a single pass
+EMERGENCY_PATTERN = keyword_pattern(CRITICAL_SYMPTOMS)
+FORM_PATTERN = keyword_pattern(FORM_TRIGGERS, whole_words=True)
+GREETING_PATTERN = keyword_pattern(GREETINGS, whole_words=True)
+TOPIC_PATTERNS = {topic: keyword_pattern((topic,)) for topic in FALLBACK_ADVICE}
+
+# Only the most recent turns are kept in memory
+MAX_HISTORY_TURNS = 6
+# Session transcripts are re-rendered every rerun and never freed by Streamlit, so cap them
+MAX_CHAT_MESSAGES = 200
+
+GENERATION_OPTIONS = {
+    "temperature": 0.7,
+    "num_predict": 300
+}
+
+# Below this much RAM, prefer a lighter installed variant (e.g. gemma3n:e2b or a q4 quant).
+# Only checked when Ollama runs on this machine; a remote server's RAM can't be seen from here.
+LOW_RAM_GB = 8
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+LIGHT_MODEL_TAGS = ("e2b", "q4")
+
+# While Ollama is down, probe for it again at most this often so a later `ollama serve` is picked up
+OLLAMA_RETRY_SECONDS = 60
+
+# Keep the model loaded between turns so users don't wait for a reload
+KEEP_ALIVE = "30m"
+
+# Each repaint resends the whole partial reply, so streamed text is redrawn at ~20 fps, not per token
+STREAM_REFRESH_SECONDS = 0.05
+
+# Model replies are stateless (system prompt + current message), so repeated questions can be answered from cache
+RESPONSE_CACHE_SIZE = 256
 
 
 class OllamaClient:
     def __init__(self, base_url="http://localhost:11434"):
         self.base_url = base_url
         self.model = "gemma3n"
-        self.available = self._check_ollama()
+        # Keep-alive connections are reused across turns instead of reconnecting per request.
+        # The client is shared by every browser session, so the pool allows concurrent chats.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=10, max_retries=Retry(total=1, backoff_factor=0.1))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self.available = False
+        # monotonic() may start near zero (e.g. right after boot), so never treat the first probe as recent
+        self._probed_at = float("-inf")
+        self._probe_lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Re-probe Ollama while it is unavailable (including after a lost connection), at most once every OLLAMA_RETRY_SECONDS"""
+        if self.available or time.monotonic() - self._probed_at < OLLAMA_RETRY_SECONDS:
+            return self.available
+        with self._probe_lock:
+            # Another session may have probed while we waited for the lock
+            if not self.available and time.monotonic() - self._probed_at >= OLLAMA_RETRY_SECONDS:
+                available = self._check_ollama()
+                self._probed_at = time.monotonic()
+                if available:
+                    # Footer is set before publishing available, which readers check without the lock
+                    self.footer = f"\n\n🤖 *Powered by {self.model} via Ollama*"
+                    # Load the model in the background so the first question doesn't pay for it
+                    threading.Thread(target=self._warm_up, daemon=True).start()
+                self.available = available
+        return self.available
 
     def _check_ollama(self):
         """Check if Ollama is running and gemma3n model is available"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get('models', [])
                 model_names = [model.get("name", "") for model in models]
                 
                 # Check for exact gemma3n match or similar
-                for name in model_names:
-                    if "gemma3n" in name.lower() or "gemma" in name.lower():
-                        self.model = name  # Use the actual model name found
-                        return True
-                return False
+                candidates = [name for name in model_names if "gemma" in name.lower()]
+                if not candidates:
+                    return False
+                candidates.sort(key=lambda name: "gemma3n" not in name.lower())
+                
+                # Low-memory machines get a smaller/quantized variant when one is installed
+                if urlparse(self.base_url).hostname in LOCAL_HOSTS:
+                    import psutil  # only needed to size the model for a local server
+                    if psutil.virtual_memory().total / (1024 ** 3) < LOW_RAM_GB:
+                        light = [name for name in candidates if any(tag in name.lower() for tag in LIGHT_MODEL_TAGS)]
+                        candidates = light or candidates
+                
+                self.model = candidates[0]  # Use the actual model name found
+                return True
             return False
         except Exception as e:
-            print(f"Ollama check failed: {e}")
+            logger.warning(f"Ollama check failed: {e}")
             return False
 
-    def generate_response(self, user_input, system_prompt):
-        """Generate response using Ollama chat API"""
+    def _warm_up(self):
+        """Preload the model into memory with an empty generate request"""
+        start = time.perf_counter()
+        try:
+            self._session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": KEEP_ALIVE},
+                timeout=120
+            ).raise_for_status()
+            logger.info(f"Ollama warmup of {self.model} took {time.perf_counter() - start:.1f}s")
+            
+            # Report whether Ollama offloaded the model to the GPU
+            running = self._session.get(f"{self.base_url}/api/ps", timeout=5).json().get("models", [])
+            for model in running:
+                if model.get("name") == self.model:
+                    if model.get("size_vram", 0) > 0:
+                        logger.info(f"{self.model} is using GPU memory ({model['size_vram'] / (1024 ** 3):.1f} GB VRAM)")
+                    else:
+                        logger.info(f"{self.model} is running on CPU only (no GPU offload)")
+        except Exception as e:
+            logger.warning(f"Ollama warmup failed: {e}")
+
+    def generate_response(self, user_input, system_prompt, callback=None):
+        """Generate response using Ollama chat API, streaming partial text to callback"""
         if not self.available:
             return None
             
@@ -82,131 +239,151 @@ class OllamaClient:
             payload = {
                 "model": self.model,
                 "messages": messages,
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 300
-                },
-                "stream": False
+                "options": GENERATION_OPTIONS,
+                "keep_alive": KEEP_ALIVE,
+                "stream": True
             }
             
-            response = requests.post(
+            with self._session.post(
                 f"{self.base_url}/api/chat",
                 json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("message", {}).get("content", "").strip()
-            else:
-                print(f"Ollama API error: {response.status_code} - {response.text}")
-                return None
+                timeout=30,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                    return None
                 
+                content = ""
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        logger.error(f"Ollama API error: {chunk['error']}")
+                        return None
+                    content += chunk.get("message", {}).get("content", "")
+                    if callback:
+                        callback(content)
+                return content.strip()
+                
+        except requests.exceptions.ConnectionError as e:
+            # Ollama stopped or restarted: fall back and let refresh() probe for it again
+            logger.error(f"Ollama connection lost: {e}")
+            self.available = False
+            return None
         except Exception as e:
-            print(f"Ollama generation error: {e}")
+            logger.error(f"Ollama generation error: {e}")
             return None
 
 
+@st.cache_resource
+def get_ollama_client():
+    """Shared Ollama client, so one connection pool and one warmup serve every session"""
+    return OllamaClient()
+
+
+class ResponseCache:
+    """Thread-safe LRU of model replies keyed by model and normalized question"""
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model, user_input):
+        """Ignore case and spacing differences so "Hi  there" and "hi there" share an entry"""
+        return model, " ".join(user_input.casefold().split())
+
+    def get(self, key):
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_response_cache():
+    """Reply cache shared by all sessions"""
+    return ResponseCache()
+
+
 class MedicalChatbot:
     def __init__(self):
-        self.ollama = OllamaClient()
-        self.history = []
-
-    def generate_response(self, user_input):
-        """Generate response using gemma3n or fallback"""
-        user_input_lower = user_input.lower()
-        
+        self.history = deque(maxlen=MAX_HISTORY_TURNS)
+        self.turns = 0
+
+    @property
+    def ollama(self):
+        """Shared Ollama client, re-probed while Ollama is not reachable"""
+        client = get_ollama_client()
+        client.refresh()
+        return client
+
+    def generate_response(self, user_input, callback=None):
+        """Generate response using gemma3n or fallback; callback receives partial AI text while streaming"""
         # Emergency check first (always use rule-based for safety)
-        for symptom in CRITICAL_SYMPTOMS:
-            if symptom in user_input_lower:
-                emergency_response = f"🚨 EMERGENCY: {symptom} detected!\n\n1. Call emergency services IMMEDIATELY (112 or 115)\n2. Do NOT wait for further instructions\n3. Follow operator guidance\n\nThis is a medical emergency - seek help now!"
-                self.history.append({"user": user_input, "assistant": emergency_response})
-                return emergency_response
+        match = EMERGENCY_PATTERN.search(user_input)
+        if match:
+            symptom = match.group(0).lower()
+            emergency_response = f"🚨 EMERGENCY: {symptom} detected!\n\n1. Call emergency services IMMEDIATELY (112 or 115)\n2. Do NOT wait for further instructions\n3. Follow operator guidance\n\nThis is a medical emergency - seek help now!"
+            self._remember(user_input, emergency_response)
+            return emergency_response
+        
+        # Form requests are canned, no need to call the model
+        if FORM_PATTERN.search(user_input):
+            self._remember(user_input, FORM_RESPONSE)
+            return FORM_RESPONSE
         
         # Try Ollama/gemma3n first
-        if self.ollama.available:
+        ollama = self.ollama
+        if ollama.available:
+            cache = get_response_cache()
+            cache_key = cache.key(ollama.model, user_input)
+            cached_response = cache.get(cache_key)
+            if cached_response:
+                self._remember(user_input, cached_response)
+                return cached_response
             try:
-                response = self.ollama.generate_response(user_input, SYSTEM_PROMPT)
+                response = ollama.generate_response(user_input, SYSTEM_PROMPT, callback)
                 if response:
-                    full_response = f"{response}\n\n🤖 *Powered by {self.ollama.model} via Ollama*"
-                    self.history.append({"user": user_input, "assistant": full_response})
+                    full_response = f"{response}{ollama.footer}"
+                    cache.put(cache_key, full_response)
+                    self._remember(user_input, full_response)
                     return full_response
             except Exception as e:
-                print(f"Ollama response error: {e}")
+                logger.error(f"Ollama response error: {e}")
         
         # Fallback to rule-based responses
         fallback_response = self._fallback_response(user_input)
-        self.history.append({"user": user_input, "assistant": fallback_response})
+        self._remember(user_input, fallback_response)
         return fallback_response
 
+    def _remember(self, user_input, response):
+        """Record a turn, evicting the oldest once the window is full"""
+        self.history.append({"user": user_input, "assistant": response})
+        self.turns += 1
+
     def _fallback_response(self, user_input):
         """Rule-based fallback responses"""
-        user_input_lower = user_input.lower()
-        
-        # Form requests
-        if any(word in user_input_lower for word in ["form", "doctor", "contact", "appointment"]):
-            return "📋 Medical Form Available In The Menu. Fill out the form and it will be sent to one of our trusted doctors."
-        
         # Greetings
-        if any(word in user_input_lower for word in ["hi", "hello", "hey", "good morning", "good afternoon"]):
+        if GREETING_PATTERN.search(user_input):
             return "Hello! I'm a medical information assistant. How can I help you today? Please describe any symptoms or health concerns you have."
         
         # Common symptoms
-        if "headache" in user_input_lower:
-            return """For headaches, consider these approaches:
-
-**Immediate relief:**
-- Rest in a quiet, dark room
-- Apply cold or warm compress
-- Stay hydrated
-- Gentle neck/shoulder massage
-
-**When to see a doctor:**
-- Sudden, severe headaches
-- Headaches with fever, stiff neck, or vision changes
-- Persistent or worsening headaches
-
-Please consult a healthcare professional for proper diagnosis.
-
-⚠️ *Fallback response - Ollama/gemma3n not available*"""
-
-        elif "fever" in user_input_lower:
-            return """For fever management:
-
-**Home care:**
-- Rest and drink plenty of fluids
-- Use fever reducers as directed
-- Monitor temperature regularly
-- Light, comfortable clothing
-
-**Seek medical attention if:**
-- Fever above 103°F (39.4°C)
-- Fever with severe symptoms
-- Fever in young children or elderly
-- Persistent fever over 3 days
-
-Please consult a healthcare professional for proper diagnosis.
-
-⚠️ *Fallback response - Ollama/gemma3n not available*"""
-
-        elif "cough" in user_input_lower:
-            return """For cough relief:
-
-**Home remedies:**
-- Stay hydrated with warm liquids
-- Use a humidifier
-- Honey (for children over 1 year)
-- Avoid irritants and smoke
-
-**See a doctor if:**
-- Cough produces blood
-- Persistent cough over 2 weeks
-- Cough with high fever
-- Difficulty breathing
-
-Please consult a healthcare professional for proper diagnosis.
-
-⚠️ *Fallback response - Ollama/gemma3n not available*"""
+        # Checked in FALLBACK_ADVICE order, so headache wins over fever and fever over cough
+        for topic, pattern in TOPIC_PATTERNS.items():
+            if pattern.search(user_input):
+                return FALLBACK_RESPONSES[topic]
 
         # Default response
         return f"""Thank you for your question about: "{user_input}"
@@ -222,25 +399,33 @@ Please consult a healthcare professional for proper diagnosis and treatment.
 
     def reset_history(self):
         """Reset conversation history"""
-        self.history = []
+        self.history.clear()
+        self.turns = 0
 
     def get_status(self):
         """Get chatbot status"""
+        ollama = self.ollama
         return {
-            "ollama_available": self.ollama.available,
-            "model": self.ollama.model if self.ollama.available else "None",
-            "conversation_turns": len(self.history),
-            "mode": f"AI ({self.ollama.model})" if self.ollama.available else "Fallback"
+            "ollama_available": ollama.available,
+            "model": ollama.model if ollama.available else "None",
+            "conversation_turns": self.turns,
+            "mode": f"AI ({ollama.model})" if ollama.available else "Fallback"
         }
 
 
-def render_sidebar(bot):
+def add_chat_message(role, content):
+    """Append to the session transcript, dropping the oldest messages past MAX_CHAT_MESSAGES"""
+    chat_history = st.session_state.chat_history
+    chat_history.append({"role": role, "content": content})
+    del chat_history[:-MAX_CHAT_MESSAGES]
+
+
+def render_sidebar(bot, status):
     """Render sidebar with controls and medical form"""
     with st.sidebar:
         st.title("🏥 Medical Chatbot")
         
         # System Status
-        status = bot.get_status()
         st.subheader("🔧 System Status")
         
         if status['ollama_available']:
@@ -294,7 +479,7 @@ def render_sidebar(bot):
                     
                     # Add form submission to chat
                     form_summary = f"Medical form submitted:\n**Patient:** {name}, {age} years old\n**Symptoms:** {symptoms}\n**Urgency:** {urgency}"
-                    st.session_state.chat_history.append({"role": "assistant", "content": form_summary})
+                    add_chat_message("assistant", form_summary)
                     st.rerun()
                 else:
                     st.error("Please fill in all required fields (*)")
@@ -312,8 +497,12 @@ def render_sidebar(bot):
 # 2. Pull gemma3n model
 ollama pull gemma3n
 
-# 3. Start Ollama service
+# 3. Start Ollama service (run only one of these)
 ollama serve
+# ...or answer several chat sessions at once instead of queueing them:
+OLLAMA_NUM_PARALLEL=4 ollama serve
+# CPU-only machines: if Ollama picks a generic runner, you can also prefix
+# OLLAMA_LLM_LIBRARY=cpu_avx2 (or cpu_avx / cpu, whichever your CPU supports)
 
 # 4. Restart this app
                 """)
@@ -321,28 +510,30 @@ ollama serve
 
 def main():
     """Main application function"""
-    # Initialize chatbot
-    bot = MedicalChatbot()
+    # Draw the title before the (possibly slow) first Ollama probe so the page paints immediately
+    st.title("🤖 Medical Assistant Chat")
+
+    # One chatbot per browser session, so it and its history survive reruns
+    if "bot" not in st.session_state:
+        st.session_state.bot = MedicalChatbot()
+    bot = st.session_state.bot
+    # Status is fixed for the rest of this rerun
+    status = bot.get_status()
 
     # Initialize session state
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
-        status = bot.get_status()
         if status['ollama_available']:
             welcome_msg = f"🏥 Welcome to Medical Chatbot!\n✅ Connected to {status['model']} via Ollama\n🤖 AI-powered medical assistance ready!"
         else:
             welcome_msg = "🏥 Welcome to Medical Chatbot!\n⚠️ Running in demo mode (Ollama not available)\n💡 Install Ollama + gemma3n for full AI capabilities"
         
-        st.session_state.chat_history.append({"role": "assistant", "content": welcome_msg})
+        add_chat_message("assistant", welcome_msg)
 
     # Render sidebar
-    render_sidebar(bot)
+    render_sidebar(bot, status)
 
-    # Main chat interface
-    st.title("🤖 Medical Assistant Chat")
-    
     # Show system status
-    status = bot.get_status()
     if status['ollama_available']:
         st.success(f"🟢 AI Mode: {status['model']} via Ollama")
     else:
@@ -356,7 +547,7 @@ def main():
     # Chat input
     if prompt := st.chat_input("How can I help you today?"):
         # Add user message
-        st.session_state.chat_history.append({"role": "user", "content": prompt})
+        add_chat_message("user", prompt)
         
         # Display user message
         with st.chat_message("user"):
@@ -364,18 +555,34 @@ def main():
         
         # Generate and display response
         with st.chat_message("assistant"):
+            placeholder = st.empty()
+            last_paint = 0.0
+            
+            def show_partial(partial):
+                """Repaint the streamed text at most every STREAM_REFRESH_SECONDS"""
+                nonlocal last_paint
+                now = time.monotonic()
+                if now - last_paint >= STREAM_REFRESH_SECONDS:
+                    placeholder.markdown(partial + "▌")
+                    last_paint = now
+            
             with st.spinner("🤖 Generating response..."):
                 try:
-                    response = bot.generate_response(prompt)
-                    st.markdown(response)
-                    st.session_state.chat_history.append({"role": "assistant", "content": response})
+                    # Show tokens as they arrive instead of waiting for the full answer
+                    response = bot.generate_response(prompt, callback=show_partial)
+                    placeholder.markdown(response)
+                    add_chat_message("assistant", response)
                 except Exception as e:
                     error_msg = f"❌ Error generating response: {str(e)}\n\nPlease try again or contact healthcare services if urgent."
                     st.error(error_msg)
-                    st.session_state.chat_history.append({"role": "assistant", "content": error_msg})
+                    add_chat_message("assistant", error_msg)
         
         st.rerun()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Quick test that only real form requests skip the model
+"""
+
+from app import FORM_PATTERN
+
+FORM_REQUESTS = [
+    "I need the medical form",
+    "I want to fill out the form",
+    "Can I get a form?",
+    "I need a doctor",
+    "Can you contact my doctor?",
+    "How do I contact a doctor?",
+    "I want to see a doctor",
+    "Can I book an appointment?",
+    "I have a severe condition",
+]
+
+MODEL_QUESTIONS = [
+    "Can you give me more information about diabetes?",
+    "my performance at the gym dropped",
+    "my shoulder looks deformed",
+    "I wear contact lenses",
+    "My doctor told me I have high blood pressure, what does that mean?",
+]
+
+def test_form_detection():
+    for text in FORM_REQUESTS:
+        assert FORM_PATTERN.search(text), f"form request not detected: '{text}'"
+    for text in MODEL_QUESTIONS:
+        assert not FORM_PATTERN.search(text), f"question wrongly sent to form: '{text}'"
+
+if __name__ == "__main__":
+    test_form_detection()
+    print("✅ Form detection OK")